@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # optional: falls back to the NumPy implementation below
+    numba = None
+
+
+def _volume_stats_loop(values: np.ndarray) -> tuple[int, float, float]:
+    # Single sweep: drop NaNs and accumulate the sum, then select the two order statistics
+    # around the 95th percentile (linear interpolation, same as np.percentile's default).
+    clean = np.empty(values.shape[0], dtype=np.float64)
+    n = 0
+    total = 0.0
+    for i in range(values.shape[0]):
+        x = values[i]
+        if not np.isnan(x):
+            clean[n] = x
+            total += x
+            n += 1
+    if n == 0:
+        return 0, np.nan, np.nan
+    clean = clean[:n]
+    pos = 0.95 * (n - 1)
+    lo = int(pos)
+    frac = pos - lo
+    part = np.partition(clean, lo)
+    low = part[lo]
+    if frac == 0.0 or lo + 1 >= n:
+        return n, total / n, low
+    high = part[lo + 1 :].min()
+    return n, total / n, low + frac * (high - low)
+
+
+def _volume_stats_numpy(values: np.ndarray) -> tuple[int, float, float]:
+    clean = values[~np.isnan(values)]
+    if clean.size == 0:
+        return 0, np.nan, np.nan
+    return int(clean.size), float(clean.mean()), float(np.percentile(clean, 95, overwrite_input=True))
+
+
+if numba is not None:
+    volume_stats = numba.njit(cache=True)(_volume_stats_loop)
+else:
+    volume_stats = _volume_stats_numpy
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import functools
+import importlib.util
+import io
+import sys
 from pathlib import Path
 from typing import Optional
 
@@ -8,6 +13,8 @@ import pandas as pd
 import torch
 from transformers import AutoModelForCausalLM, AutoTokenizer
 
+from .csv_writer import read_tail_bytes
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Analyze a CSV with Qwen using instructions.")
@@ -19,7 +26,16 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--temperature", type=float, default=0.2)
     parser.add_argument("--top-p", type=float, default=0.9)
     parser.add_argument("--max-new-tokens", type=int, default=512)
-    parser.add_argument("--attn-impl", choices=["eager", "flash_attention_2"], help="Attention implementation override.")
+    parser.add_argument("--attn-impl", choices=["eager", "sdpa", "flash_attention_2"], help="Attention implementation override.")
+    parser.add_argument("--serve", action="store_true", help="Keep the model loaded and analyze further CSV paths read from stdin.")
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help=(
+            "torch.compile the model forward (slow first call; best with --serve). Uses a static KV cache "
+            "when the model supports one, otherwise keeps the dynamic cache."
+        ),
+    )
     return parser.parse_args()
 
 
@@ -28,8 +44,16 @@ def load_instructions(path: Path) -> str:
         return fh.read()
 
 
+def _read_tail_csv(path: Path, max_rows: int, usecols=None) -> pd.DataFrame:
+    """
+    Parse only the header plus (at least) the last `max_rows` lines of a CSV.
+    """
+    return pd.read_csv(io.BytesIO(read_tail_bytes(path, max_rows, row_bytes=512)), usecols=usecols)
+
+
 def load_csv(path: Path, max_rows: int, columns: Optional[list[str]]) -> pd.DataFrame:
-    df = pd.read_csv(path)
+    usecols = (lambda c: c in columns) if columns else None
+    df = _read_tail_csv(path, max_rows, usecols) if max_rows else pd.read_csv(path, usecols=usecols)
     if columns:
         existing = [c for c in columns if c in df.columns]
         df = df[existing]
@@ -39,7 +63,7 @@ def load_csv(path: Path, max_rows: int, columns: Optional[list[str]]) -> pd.Data
 
 
 def build_prompt(instructions: str, df: pd.DataFrame, csv_path: Path) -> str:
-    preview = df.to_markdown(index=False)
+    preview = df.to_csv(index=False, float_format="%.8g")
     meta_lines = [
         f"file: {csv_path}",
         f"rows_in_sample: {len(df)}",
@@ -50,34 +74,75 @@ def build_prompt(instructions: str, df: pd.DataFrame, csv_path: Path) -> str:
         f"You are an analyst.\n"
         f"Instructions:\n{instructions}\n\n"
         f"Dataset metadata:\n{meta}\n\n"
-        f"Sample data (tabular, markdown):\n{preview}\n"
+        f"Sample data (CSV):\n{preview}\n"
     )
 
 
-def generate(
-    prompt_text: str,
-    model_id: str,
-    temperature: float,
-    top_p: float,
-    max_new_tokens: int,
-    attn_impl: Optional[str] = None,
-) -> str:
+def _supports_bf16_flash() -> bool:
+    # FlashAttention-2 and fast bf16 matmuls need Ampere (sm_80) or newer.
+    return torch.cuda.is_available() and torch.cuda.get_device_capability()[0] >= 8
+
+
+def _default_attn_impl() -> str:
+    if importlib.util.find_spec("flash_attn") is not None:
+        return "flash_attention_2"
+    return "sdpa"
+
+
+@functools.lru_cache(maxsize=2)
+def _load(model_id: str, dtype_str: str, attn_impl: Optional[str], compile_model: bool = False):
     tokenizer = AutoTokenizer.from_pretrained(model_id, trust_remote_code=True)
     model_kwargs = {
         "device_map": "auto",
-        "torch_dtype": "auto",
+        "torch_dtype": dtype_str if dtype_str == "auto" else getattr(torch, dtype_str),
         "trust_remote_code": True,
     }
     if attn_impl:
         model_kwargs["attn_implementation"] = attn_impl
     model = AutoModelForCausalLM.from_pretrained(model_id, **model_kwargs)
+    if compile_model:
+        model.forward = torch.compile(model.forward, mode="reduce-overhead", fullgraph=False)
+    return tokenizer, model
+
+
+def generate(
+    prompt_text: str,
+    model_id: str,
+    temperature: float,
+    top_p: float,
+    max_new_tokens: int,
+    attn_impl: Optional[str] = None,
+    compile_model: bool = False,
+) -> str:
+    dtype_str = "auto"
+    if _supports_bf16_flash():
+        dtype_str = "bfloat16"
+        attn_impl = attn_impl or _default_attn_impl()
+    tokenizer, model = _load(model_id, dtype_str, attn_impl, compile_model)
     messages = [
         {"role": "system", "content": "You are a careful financial data analyst."},
         {"role": "user", "content": prompt_text},
     ]
+    # The compiled Jinja template is memoized inside transformers (lru_cache on the template string),
+    # so with _load keeping the tokenizer alive, --serve only pays for rendering here.
     chat_prompt = tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
-    inputs = tokenizer(chat_prompt, return_tensors="pt").to(model.device)
-    with torch.no_grad():
+    inputs = tokenizer(chat_prompt, return_tensors="pt")
+    if model.device.type == "cuda":
+        # Pinned host buffers let the H2D copy run asynchronously instead of stalling on pageable memory.
+        inputs = {k: v.pin_memory().to(model.device, non_blocking=True) for k, v in inputs.items()}
+    else:
+        inputs = inputs.to(model.device)
+    # Without flash-attn installed, steer SDPA towards its fused kernels instead of the math fallback.
+    sdp_ctx = (
+        torch.backends.cuda.sdp_kernel(enable_flash=True, enable_math=False, enable_mem_efficient=True)
+        if attn_impl == "sdpa" and _supports_bf16_flash()
+        else contextlib.nullcontext()
+    )
+    # The dynamic KV cache changes shape every step and defeats compilation; use a fixed-size one where
+    # the model supports it (transformers only accepts "static" for models defining _setup_cache).
+    use_static = compile_model and callable(getattr(model, "_setup_cache", None))
+    cache_kwargs = {"cache_implementation": "static"} if use_static else {}
+    with torch.no_grad(), sdp_ctx:
         outputs = model.generate(
             **inputs,
             max_new_tokens=max_new_tokens,
@@ -85,24 +150,17 @@ def generate(
             temperature=temperature,
             top_p=top_p,
             eos_token_id=tokenizer.eos_token_id,
+            pad_token_id=tokenizer.eos_token_id,
+            **cache_kwargs,
         )
     generated = outputs[0][inputs["input_ids"].shape[1] :]
     return tokenizer.decode(generated, skip_special_tokens=True)
 
 
-def main() -> int:
-    args = parse_args()
-    csv_path = Path(args.csv)
-    instr_path = Path(args.instructions)
-
+def analyze_csv(csv_path: Path, instructions: str, args: argparse.Namespace) -> int:
     if not csv_path.exists():
         print(f"CSV not found: {csv_path}")
         return 1
-    if not instr_path.exists():
-        print(f"Instructions file not found: {instr_path}")
-        return 1
-
-    instructions = load_instructions(instr_path)
     df = load_csv(csv_path, args.max_rows, args.columns)
     if df.empty:
         print("No data to analyze after filtering.")
@@ -117,11 +175,38 @@ def main() -> int:
         top_p=args.top_p,
         max_new_tokens=args.max_new_tokens,
         attn_impl=args.attn_impl,
+        compile_model=args.compile,
     )
     print("\n=== Model Output ===\n")
     print(response.strip())
     return 0
 
 
+def serve(csv_path: Path, instructions: str, args: argparse.Namespace) -> int:
+    # Each stdin line names a CSV to analyze (blank line re-runs the previous one); the model stays loaded.
+    code = analyze_csv(csv_path, instructions, args)
+    for line in sys.stdin:
+        path_str = line.strip()
+        if path_str:
+            csv_path = Path(path_str)
+        code = analyze_csv(csv_path, instructions, args)
+    return code
+
+
+def main() -> int:
+    args = parse_args()
+    csv_path = Path(args.csv)
+    instr_path = Path(args.instructions)
+
+    if not instr_path.exists():
+        print(f"Instructions file not found: {instr_path}")
+        return 1
+
+    instructions = load_instructions(instr_path)
+    if args.serve:
+        return serve(csv_path, instructions, args)
+    return analyze_csv(csv_path, instructions, args)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -3,12 +3,27 @@ from __future__ import annotations
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .config import RequestConfig
+from .transform import _interval_seconds
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    retry = Retry(total=5, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+    return session
+
+
+# Shared across pages and calls so paginated fetches reuse keep-alive connections.
+_SESSION = _build_session()
 
 
 def _to_millis(dt: datetime) -> int:
@@ -24,20 +39,38 @@ def _klines_path() -> str:
     return path if path.startswith("/") else f"/{path}"
 
 
-def fetch_klines(
+def _throttle_delay(used_weight: Optional[str], request_cfg: RequestConfig) -> float:
+    """
+    Seconds to wait before the next request, based on Binance's rolling 1m weight header.
+    """
+    if used_weight is None:
+        # Endpoint did not report weight usage; keep the fixed pacing.
+        return request_cfg.rate_limit_sleep
+    threshold = 0.9 * request_cfg.weight_limit
+    used = int(used_weight)
+    if used <= threshold:
+        return 0.0
+    return 60 * (used - threshold) / request_cfg.weight_limit
+
+
+def _interval_ms(interval: str) -> Optional[int]:
+    # "1M" (month) has no fixed length and would collide with "1m" once lowercased.
+    if interval.strip().endswith("M"):
+        return None
+    seconds = _interval_seconds(interval)
+    return seconds * 1000 if seconds else None
+
+
+def _fetch_range(
     symbol: str,
     interval: str,
-    start_time: datetime,
-    end_time: Optional[datetime],
+    start_ms: int,
+    end_ms: Optional[int],
     request_cfg: RequestConfig,
     logger: logging.Logger,
 ) -> list[list[Any]]:
-    """
-    Paginate through Binance klines for the provided range.
-    """
     params_base = {"symbol": symbol, "interval": interval, "limit": request_cfg.limit}
-    current_start = _to_millis(start_time)
-    end_ms = _to_millis(end_time) if end_time else None
+    current_start = start_ms
     all_rows: List[list[Any]] = []
 
     while True:
@@ -46,8 +79,13 @@ def fetch_klines(
         if end_ms:
             params["endTime"] = end_ms
         logger.debug("Requesting klines", extra={"symbol": symbol, "interval": interval, "start_ms": current_start})
-        resp = requests.get(f"{_base_url()}{_klines_path()}", params=params, timeout=request_cfg.timeout)
+        resp = _SESSION.get(f"{_base_url()}{_klines_path()}", params=params, timeout=request_cfg.timeout)
         resp.raise_for_status()
+        # Check the weight on every response: concurrent shards are single pages that break out below,
+        # and pacing them here keeps workers from overrunning the limit into 429s/418 bans.
+        delay = _throttle_delay(resp.headers.get("X-MBX-USED-WEIGHT-1M"), request_cfg)
+        if delay:
+            time.sleep(delay)
         chunk: list[list[Any]] = resp.json()
         if not chunk:
             break
@@ -58,6 +96,38 @@ def fetch_klines(
         if len(chunk) < request_cfg.limit:
             break
         current_start = last_close + 1
-        time.sleep(request_cfg.rate_limit_sleep)
 
     return all_rows
+
+
+def fetch_klines(
+    symbol: str,
+    interval: str,
+    start_time: datetime,
+    end_time: Optional[datetime],
+    request_cfg: RequestConfig,
+    logger: logging.Logger,
+) -> list[list[Any]]:
+    """
+    Fetch Binance klines for the provided range.
+
+    Bounded ranges are split into one-page shards (interval * limit) that are fetched
+    concurrently; open-ended ranges and unknown intervals fall back to sequential paging.
+    """
+    start_ms = _to_millis(start_time)
+    end_ms = _to_millis(end_time) if end_time else None
+    step_ms = _interval_ms(interval)
+    if not end_ms or not step_ms or request_cfg.concurrency <= 1:
+        return _fetch_range(symbol, interval, start_ms, end_ms, request_cfg, logger)
+
+    step_ms *= request_cfg.limit
+    shards = [(t, min(t + step_ms - 1, end_ms)) for t in range(start_ms, end_ms + 1, step_ms)]
+    if len(shards) == 1:
+        return _fetch_range(symbol, interval, start_ms, end_ms, request_cfg, logger)
+
+    with ThreadPoolExecutor(max_workers=min(request_cfg.concurrency, len(shards))) as pool:
+        pages = pool.map(lambda shard: _fetch_range(symbol, interval, shard[0], shard[1], request_cfg, logger), shards)
+        all_rows: List[list[Any]] = []
+        for rows in pages:
+            all_rows.extend(rows)
+    return all_rows
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
@@ -8,12 +10,18 @@ from typing import Optional
 import yaml
 from zoneinfo import ZoneInfo
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 
 @dataclass
 class ExcelConfig:
     path: Path
     append: bool = True
     sheet_name: str = "{symbol}_{interval}"
+    format: str = "csv"
 
 
 @dataclass
@@ -21,6 +29,8 @@ class RequestConfig:
     limit: int = 1000
     rate_limit_sleep: float = 0.2
     timeout: int = 30
+    concurrency: int = 4
+    weight_limit: int = 6000
 
 
 @dataclass
@@ -31,17 +41,18 @@ class AppConfig:
     logging_level: str = "INFO"
 
 
+_DURATION_RE = re.compile(r"^\s*(\d+)\s*([mhd])\s*$", re.IGNORECASE)
+_DURATION_UNITS = {"m": "minutes", "h": "hours", "d": "days"}
+
+
+@lru_cache(maxsize=64)
 def parse_duration(expr: str) -> timedelta:
     if not expr:
         raise ValueError("lookback value is empty")
-    units = {"m": "minutes", "h": "hours", "d": "days"}
-    expr = expr.strip().lower()
-    value_part = "".join(ch for ch in expr if ch.isdigit())
-    unit_part = "".join(ch for ch in expr if ch.isalpha())
-    if not value_part or unit_part not in units:
-        raise ValueError(f"Unsupported duration '{expr}'. Use formats like 30m, 12h, 3d.")
-    value = int(value_part)
-    return timedelta(**{units[unit_part]: value})
+    match = _DURATION_RE.match(expr)
+    if not match:
+        raise ValueError(f"Unsupported duration '{expr.strip()}'. Use formats like 30m, 12h, 3d.")
+    return timedelta(**{_DURATION_UNITS[match.group(2).lower()]: int(match.group(1))})
 
 
 def parse_datetime(raw: Optional[datetime | str], input_tz: Optional[str] = None) -> Optional[datetime]:
@@ -54,7 +65,7 @@ def parse_datetime(raw: Optional[datetime | str], input_tz: Optional[str] = None
 
     # If a preferred input timezone is provided, interpret the value in that zone (ignoring any embedded tz).
     if input_tz:
-        parsed = parsed.replace(tzinfo=None).replace(tzinfo=ZoneInfo(input_tz))
+        parsed = parsed.replace(tzinfo=resolve_timezone(input_tz))
     elif parsed.tzinfo is None:
         parsed = parsed.replace(tzinfo=timezone.utc)
 
@@ -63,7 +74,7 @@ def parse_datetime(raw: Optional[datetime | str], input_tz: Optional[str] = None
 
 def load_config(path: Path | str) -> AppConfig:
     with open(path, "r", encoding="utf-8") as fh:
-        data = yaml.safe_load(fh) or {}
+        data = yaml.load(fh, Loader=_YamlLoader) or {}
     excel_cfg = data.get("excel") or {}
     request_cfg = data.get("request") or {}
     return AppConfig(
@@ -71,17 +82,21 @@ def load_config(path: Path | str) -> AppConfig:
             path=Path(excel_cfg.get("path", "./data/ohlcv.xlsx")),
             append=bool(excel_cfg.get("append", True)),
             sheet_name=str(excel_cfg.get("sheet_name", "{symbol}_{interval}")),
+            format=str(excel_cfg.get("format", "csv")).lower(),
         ),
         request=RequestConfig(
             limit=int(request_cfg.get("limit", 1000)),
             rate_limit_sleep=float(request_cfg.get("rate_limit_sleep", 0.2)),
             timeout=int(request_cfg.get("timeout", 30)),
+            concurrency=int(request_cfg.get("concurrency", 4)),
+            weight_limit=int(request_cfg.get("weight_limit", 6000)),
         ),
         timezone=data.get("timezone") or None,
         logging_level=str(data.get("logging_level", "INFO")).upper(),
     )
 
 
+@lru_cache(maxsize=None)
 def resolve_timezone(tz_name: Optional[str]) -> Optional[ZoneInfo]:
     if not tz_name:
         return None
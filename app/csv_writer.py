@@ -1,27 +1,214 @@
 from __future__ import annotations
 
+import io
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 from .config import ExcelConfig
+from .transform import merge_sorted_frames
+
+_COLUMN_TYPES = {
+    "timestamp": pa.timestamp("ns"),
+    **{
+        col: pa.float64()
+        for col in ["open", "high", "low", "close", "volume", "quote_volume", "taker_buy_base", "taker_buy_quote"]
+    },
+}
+
+
+def data_path(excel_cfg: ExcelConfig, symbol: str, interval: str) -> Path:
+    return _resolve_data_path(str(excel_cfg.path), excel_cfg.format, symbol, interval)
+
+
+@lru_cache(maxsize=64)
+def _resolve_data_path(template: str, fmt: str, symbol: str, interval: str) -> Path:
+    path = Path(template.format(symbol=symbol, interval=interval))
+    if fmt == "parquet":
+        path = path.with_suffix(".parquet")
+    return path
+
+
+def _is_parquet(path) -> bool:
+    return Path(path).suffix.lower() == ".parquet"
+
+
+def read_csv_typed(path: Path, columns: Optional[list[str]] = None) -> pd.DataFrame:
+    try:
+        table = pacsv.read_csv(
+            path,
+            convert_options=pacsv.ConvertOptions(column_types=_COLUMN_TYPES, include_columns=columns),
+        )
+    except pa.ArrowInvalid:
+        # Timestamps written with a UTC offset keep pandas' wall-time parsing.
+        return pd.read_csv(path, parse_dates=["timestamp"], usecols=columns)
+    return table.to_pandas(self_destruct=True)
+
+
+def read_table(path: Path, columns: Optional[list[str]] = None) -> pd.DataFrame:
+    """
+    Read a stored data file, Parquet or CSV by suffix, optionally only `columns`.
+    """
+    if _is_parquet(path):
+        return pq.read_table(path, columns=columns).to_pandas(self_destruct=True)
+    return read_csv_typed(path, columns)
+
+
+def read_tail(path: Path, rows: int) -> pd.DataFrame:
+    if not _is_parquet(path):
+        return read_csv_tail(path, rows)
+    pf = pq.ParquetFile(path)
+    groups: list[int] = []
+    buffered = 0
+    for i in reversed(range(pf.num_row_groups)):
+        groups.insert(0, i)
+        buffered += pf.metadata.row_group(i).num_rows
+        if buffered >= rows:
+            break
+    table = pf.read_row_groups(groups)
+    return table.slice(max(0, table.num_rows - rows)).to_pandas()
+
+
+def read_tail_bytes(path: Path, rows: int, row_bytes: int = 256) -> bytes:
+    """
+    Header line plus at least the last `rows` complete lines of a CSV, read by seeking back from EOF
+    with a window that starts at rows * row_bytes and doubles until enough lines are covered.
+    """
+    with open(path, "rb") as fh:
+        header = fh.readline()
+        body_start = fh.tell()
+        size = fh.seek(0, 2)
+        window = max(rows, 1) * row_bytes
+        while True:
+            offset = max(body_start, size - window)
+            fh.seek(offset)
+            tail = fh.read()
+            if offset == body_start:
+                break
+            if tail.count(b"\n") > rows:
+                # Drop the (possibly partial) line the seek landed in.
+                tail = tail.split(b"\n", 1)[1]
+                break
+            window *= 2
+    return header + tail
+
+
+def read_csv_tail(path: Path, rows: int) -> pd.DataFrame:
+    """
+    Last `rows` rows of a CSV; only the header and a window at the end of the file are parsed.
+    """
+    data = io.BytesIO(read_tail_bytes(path, rows))
+    try:
+        table = pacsv.read_csv(data, convert_options=pacsv.ConvertOptions(column_types=_COLUMN_TYPES))
+    except pa.ArrowInvalid:
+        data.seek(0)
+        return pd.read_csv(data).tail(rows).reset_index(drop=True)
+    return table.slice(max(0, table.num_rows - rows)).to_pandas()
+
+
+def _naive_table(df: pd.DataFrame, seconds: bool) -> pa.Table:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if not pa.types.is_timestamp(field.type):
+            continue
+        col = table.column(i)
+        if field.type.tz is not None:
+            col = pc.local_timestamp(col)
+        if seconds:
+            try:
+                col = col.cast(pa.timestamp("s"))
+            except pa.ArrowInvalid:
+                col = col.cast(pa.timestamp(field.type.unit))
+        table = table.set_column(i, field.name, col)
+    return table
+
+
+def write_csv_typed(df: pd.DataFrame, sink, include_header: bool = True) -> None:
+    """
+    Write `df` with Arrow's C++ CSV writer. `sink` is a path or a binary file handle.
+    Timestamps are stored as naive wall time, at second precision when nothing is lost.
+    """
+    table = _naive_table(df, seconds=True)
+    pacsv.write_csv(table, sink, write_options=pacsv.WriteOptions(include_header=include_header))
+
+
+def write_table(df: pd.DataFrame, path: Path) -> None:
+    """
+    Write a stored data file, Parquet or CSV by suffix. Parquet keeps naive ns timestamps.
+    """
+    if _is_parquet(path):
+        pq.write_table(_naive_table(df, seconds=False), str(path), compression="snappy")
+    else:
+        write_csv_typed(df, str(path))
+
+
+def normalize_timestamp(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coerce `timestamp` to naive datetime64 wall time, in place; callers pass frames they own.
+    """
+    if "timestamp" not in df.columns:
+        return df
+    ts = df["timestamp"]
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        ts = pd.to_datetime(ts, errors="coerce")
+    if isinstance(ts.dtype, pd.DatetimeTZDtype):
+        ts = ts.dt.tz_localize(None)
+    if ts is not df["timestamp"]:
+        df["timestamp"] = ts
+    return df
+
+
+def normalize_sorted(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    normalize_timestamp() plus a sort by timestamp when the stored rows are out of order.
+    """
+    df = normalize_timestamp(df)
+    if "timestamp" in df.columns and not df["timestamp"].is_monotonic_increasing:
+        df = df.sort_values("timestamp", ignore_index=True)
+    return df
 
 
 def read_dataframe(excel_cfg: ExcelConfig, symbol: str, interval: str) -> pd.DataFrame:
-    path = Path(str(excel_cfg.path).format(symbol=symbol, interval=interval))
+    path = data_path(excel_cfg, symbol, interval)
     if not path.exists():
         return pd.DataFrame()
     try:
-        df = pd.read_csv(path, parse_dates=["timestamp"])
+        df = read_table(path)
     except Exception:
         return pd.DataFrame()
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-        if pd.api.types.is_datetime64tz_dtype(df["timestamp"]):
-            df["timestamp"] = df["timestamp"].dt.tz_localize(None)
-    return df
+    return normalize_sorted(df)
+
+
+def _last_timestamp(path: Path, columns: list[str]) -> Optional[pd.Timestamp]:
+    """
+    Return the timestamp of the final row if the file's header matches `columns`.
+    Files are kept sorted by timestamp, so the last row holds the maximum.
+    """
+    if "timestamp" not in columns:
+        return None
+    with open(path, "rb") as fh:
+        header = fh.readline().decode("utf-8").rstrip("\r\n")
+        if [name.strip('"') for name in header.split(",")] != columns:
+            return None
+        size = fh.seek(0, 2)
+        block = min(size, 4096)
+        fh.seek(size - block)
+        tail = fh.read().rstrip(b"\r\n")
+    if b"\n" not in tail:
+        return None
+    values = tail.rsplit(b"\n", 1)[-1].decode("utf-8").split(",")
+    if len(values) != len(columns):
+        return None
+    last = pd.Timestamp(values[columns.index("timestamp")].strip('"'))
+    # Rows stored with a UTC offset predate naive storage; let the merge path rewrite them.
+    return last if last.tzinfo is None else None
 
 
 def write_dataframe(
@@ -35,24 +222,41 @@ def write_dataframe(
         logger.info("No data to write", extra={"symbol": symbol, "interval": interval})
         return None
 
-    path_str = str(excel_cfg.path).format(symbol=symbol, interval=interval)
-    path: Path = Path(path_str)
+    path = data_path(excel_cfg, symbol, interval)
     path.parent.mkdir(parents=True, exist_ok=True)
+    if "timestamp" in df.columns:
+        # Shallow copy: only the timestamp column is replaced, the caller's frame is untouched.
+        df = normalize_timestamp(df.copy(deep=False))
     combined = df
 
     if path.exists() and excel_cfg.append:
+        last_ts = None
+        if not _is_parquet(path):
+            try:
+                last_ts = _last_timestamp(path, [str(c) for c in df.columns])
+            except Exception:
+                pass
+        first_new = df["timestamp"].min() if "timestamp" in df.columns else None
+        if last_ts is not None and pd.notnull(first_new) and first_new > last_ts:
+            # Strictly newer rows: append without re-reading the history.
+            with open(path, "ab", buffering=1 << 20) as fh:
+                write_csv_typed(df.sort_values("timestamp"), fh, include_header=False)
+            logger.info(
+                "Appended CSV",
+                extra={"symbol": symbol, "interval": interval, "rows": len(df), "path": str(path)},
+            )
+            return df
         try:
-            existing = pd.read_csv(path, parse_dates=["timestamp"])
-            combined = pd.concat([existing, df], ignore_index=True)
-            combined = combined.drop_duplicates(subset=["timestamp", "symbol", "interval"]).sort_values("timestamp")
+            existing = normalize_timestamp(read_table(path))
+            combined = merge_sorted_frames([existing, df])
         except Exception:
             combined = df
     elif not excel_cfg.append:
         combined = df
 
-    combined.to_csv(path, index=False)
+    write_table(combined, path)
     logger.info(
-        "Wrote CSV",
+        "Wrote Parquet" if _is_parquet(path) else "Wrote CSV",
         extra={
             "symbol": symbol,
             "interval": interval,
@@ -13,7 +13,7 @@ from dotenv import load_dotenv
 from .binance_client import fetch_klines
 from .config import AppConfig, load_config, parse_datetime, parse_duration
 from .csv_writer import read_dataframe, write_dataframe
-from .transform import count_missing_rows, klines_to_dataframe
+from .transform import count_missing_rows, klines_to_dataframe, merge_sorted_frames
 
 
 def build_logger(level: str) -> logging.Logger:
@@ -59,13 +59,25 @@ def resolve_window(start: Optional[str], end: Optional[str], lookback: Optional[
     return start_dt, end_dt
 
 
+def timestamp_bounds(df: pd.DataFrame) -> tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    """
+    First/last naive timestamp of a frame sorted by timestamp (see read_dataframe).
+    """
+    if df.empty or "timestamp" not in df.columns:
+        return None, None
+    ts = df["timestamp"]
+    first, last = ts.iloc[0], ts.iloc[-1]
+    if pd.isnull(first) or pd.isnull(last):
+        first, last = ts.min(), ts.max()
+    if getattr(first, "tzinfo", None) is not None:
+        first, last = first.tz_localize(None), last.tz_localize(None)
+    return first, last
+
+
 def compute_fetch_ranges(existing: pd.DataFrame, start_time: datetime, end_time: datetime) -> list[tuple[datetime, datetime]]:
     if existing.empty or "timestamp" not in existing.columns:
         return [(start_time, end_time)]
-    ts = existing["timestamp"]
-    if pd.api.types.is_datetime64tz_dtype(ts):
-        ts = ts.dt.tz_localize(None)
-    min_ts, max_ts = ts.min(), ts.max()
+    min_ts, max_ts = timestamp_bounds(existing)
     if pd.notnull(min_ts) and pd.notnull(max_ts) and min_ts <= start_time and max_ts >= end_time:
         return []
     ranges: list[tuple[datetime, datetime]] = []
@@ -132,8 +144,7 @@ def main() -> int:
         )
         df_parts.append(df_new)
 
-    df = pd.concat(df_parts, ignore_index=True) if df_parts else existing
-    df = df.drop_duplicates(subset=["timestamp", "symbol", "interval"]).sort_values("timestamp")
+    df = merge_sorted_frames(df_parts) if df_parts else existing
 
     if args.dry_run:
         return 0
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 
 @dataclass
 class OperationSpec:
@@ -21,8 +28,16 @@ class OperationSpec:
 
 
 def load_operations(path: Path) -> dict[str, OperationSpec]:
-    with open(path, "r", encoding="utf-8") as fh:
-        data = yaml.safe_load(fh) or {}
+    path_str = str(path)
+    specs = _load_operations_cached(path_str, os.path.getmtime(path_str))
+    # Callers (e.g. the UI) mutate specs in place, so hand out copies of the cached ones.
+    return {name: replace(spec) for name, spec in specs.items()}
+
+
+@lru_cache(maxsize=8)
+def _load_operations_cached(path_str: str, mtime: float) -> dict[str, OperationSpec]:
+    with open(path_str, "r", encoding="utf-8") as fh:
+        data = yaml.load(fh, Loader=_YamlLoader) or {}
     defaults = data.get("defaults") or {}
     items = data.get("operations") or []
     specs: dict[str, OperationSpec] = {}
@@ -30,7 +45,6 @@ def load_operations(path: Path) -> dict[str, OperationSpec]:
     def field(item: dict, key: str):
         return item.get(key, defaults.get(key))
 
-
     for item in items:
         name = item.get("name")
         if not name:
@@ -5,16 +5,17 @@ import sys
 from datetime import timezone
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 
 from .binance_client import fetch_klines
 from .config import load_config, resolve_timezone
-from .csv_writer import read_dataframe, write_dataframe
-from .ingest import build_logger
+from .csv_writer import data_path, normalize_timestamp, read_dataframe, write_dataframe, write_table
+from .ingest import build_logger, timestamp_bounds
 from .operations import load_operations, OperationSpec
 from .stats import run_volume_stats, resolve_window_with_overrides
-from .transform import count_missing_rows, klines_to_dataframe
+from .transform import count_missing_rows, klines_to_dataframe, merge_sorted_frames
 
 
 def to_naive_local(dt: pd.Timestamp, data_tz) -> pd.Timestamp:
@@ -38,17 +39,6 @@ def convert_local_range_to_utc(start_local: pd.Timestamp, end_local: pd.Timestam
     return s, e
 
 
-def normalize_timestamp(df: pd.DataFrame) -> pd.DataFrame:
-    if "timestamp" not in df.columns:
-        return df
-    out = df.copy()
-    ts = pd.to_datetime(out["timestamp"], errors="coerce")
-    if isinstance(ts.dtype, pd.DatetimeTZDtype):
-        ts = ts.dt.tz_localize(None)
-    out["timestamp"] = ts
-    return out
-
-
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run a named operation using predefined parameters.")
     parser.add_argument("--config", default="config.yml", help="Path to base config file.")
@@ -103,13 +93,10 @@ def run_generate_slice(op: OperationSpec, cfg, logger):
     end_local = to_naive_local(end_time, data_tz)
 
     existing = normalize_timestamp(read_dataframe(cfg.excel, op.symbol, op.interval))
-    ts = existing["timestamp"] if ("timestamp" in existing.columns) else pd.Series(dtype="datetime64[ns]")
-    if isinstance(ts.dtype, pd.DatetimeTZDtype):
-        ts = ts.dt.tz_localize(None)
-    min_ts, max_ts = (ts.min(), ts.max()) if not ts.empty else (None, None)
+    min_ts, max_ts = timestamp_bounds(existing)
 
     fetch_ranges_local = []
-    if ts.empty:
+    if min_ts is None:
         fetch_ranges_local = [(start_local, end_local)]
     else:
         if pd.notnull(min_ts) and start_local < min_ts:
@@ -139,12 +126,11 @@ def run_generate_slice(op: OperationSpec, cfg, logger):
         )
         df_parts.append(df_new)
 
-    combined = normalize_timestamp(pd.concat(df_parts, ignore_index=True) if df_parts else existing)
-    combined = combined.drop_duplicates(subset=["timestamp", "symbol", "interval"]).sort_values("timestamp")
+    combined = merge_sorted_frames(df_parts) if df_parts else existing
 
-    # Update the base CSV with combined data
-    base_path = Path(str(cfg.excel.path).format(symbol=op.symbol, interval=op.interval))
-    combined.to_csv(base_path, index=False)
+    # Update the base file with combined data
+    base_path = data_path(cfg.excel, op.symbol, op.interval)
+    write_table(combined, base_path)
 
     # Write the sliced CSV (overwrite)
     slice_path = (
@@ -152,8 +138,12 @@ def run_generate_slice(op: OperationSpec, cfg, logger):
         if op.slice_output_path
         else base_path.with_name(f"{base_path.stem}_sliced{base_path.suffix}")
     )
-    slice_df = combined[(combined["timestamp"] >= start_local) & (combined["timestamp"] <= end_local)]
-    slice_df.to_csv(slice_path, index=False)
+    # combined is sorted by timestamp, so the window is a contiguous block found by binary search.
+    ts = combined["timestamp"].to_numpy()
+    lo = np.searchsorted(ts, start_local.to_datetime64(), side="left")
+    hi = np.searchsorted(ts, end_local.to_datetime64(), side="right")
+    slice_df = combined.iloc[lo:hi]
+    write_table(slice_df, slice_path)
     logger.info(
         "Generated sliced CSV",
         extra={
@@ -179,15 +169,12 @@ def run_fetch(op: OperationSpec, cfg, logger):
     )
     data_tz = resolve_timezone(cfg.timezone)
     existing = normalize_timestamp(read_dataframe(cfg.excel, op.symbol, op.interval))
-    ts = existing["timestamp"] if ("timestamp" in existing.columns) else pd.Series(dtype="datetime64[ns]")
-    if isinstance(ts.dtype, pd.DatetimeTZDtype):
-        ts = ts.dt.tz_localize(None)
-    min_ts, max_ts = (ts.min(), ts.max()) if not ts.empty else (None, None)
+    min_ts, max_ts = timestamp_bounds(existing)
     start_local = to_naive_local(start_time, data_tz)
     end_local = to_naive_local(end_time, data_tz)
 
     fetch_ranges_local = []
-    if ts.empty:
+    if min_ts is None:
         fetch_ranges_local = [(start_local, end_local)]
     else:
         if pd.notnull(min_ts) and start_local < min_ts:
@@ -218,8 +205,7 @@ def run_fetch(op: OperationSpec, cfg, logger):
         )
         df_parts.append(df_new)
 
-    df_out = normalize_timestamp(pd.concat(df_parts, ignore_index=True) if df_parts else existing)
-    df_out = df_out.drop_duplicates(subset=["timestamp", "symbol", "interval"]).sort_values("timestamp")
+    df_out = merge_sorted_frames(df_parts) if df_parts else existing
     write_dataframe(df_out, cfg.excel, op.symbol, op.interval, logger)
     return 0
 
@@ -4,17 +4,23 @@ import argparse
 import logging
 import sys
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 
+from ._kernels import volume_stats
 from .binance_client import fetch_klines
 from .config import AppConfig, load_config, parse_datetime, parse_duration, resolve_timezone
-from .csv_writer import write_dataframe
-from .ingest import build_logger
-from .transform import klines_to_dataframe
+from .csv_writer import data_path, normalize_sorted, normalize_timestamp, read_table, write_dataframe
+from .ingest import build_logger, timestamp_bounds
+from .transform import klines_to_dataframe, merge_sorted_frames
+
+# Volume stats only need these two columns; both backends skip the rest on read.
+_STATS_COLUMNS = ("timestamp", "volume")
 
 
 def parse_args() -> argparse.Namespace:
@@ -29,61 +35,80 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def load_sheet(excel_cfg, symbol: str, interval: str) -> pd.DataFrame:
-    path = Path(str(excel_cfg.path).format(symbol=symbol, interval=interval))
-    if not path.exists():
-        return pd.DataFrame()
+def load_sheet(excel_cfg, symbol: str, interval: str, columns: Optional[tuple[str, ...]] = None) -> pd.DataFrame:
+    """
+    Load the stored data file (CSV or Parquet) for symbol/interval, optionally only `columns`.
+    Frames are cached per file version (path, mtime, size), so callers must treat the result as read-only.
+    """
+    path = data_path(excel_cfg, symbol, interval)
     try:
-        df = pd.read_csv(path, parse_dates=["timestamp"])
-    except Exception:
+        stat = path.stat()
+    except OSError:
         return pd.DataFrame()
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-        if pd.api.types.is_datetime64tz_dtype(df["timestamp"]):
-            df["timestamp"] = df["timestamp"].dt.tz_localize(None)
-    return df
-
+    return _load_sheet_cached(str(path), stat.st_mtime_ns, stat.st_size, columns)
 
-def _ensure_naive(ts: pd.Timestamp) -> pd.Timestamp:
-    t = pd.Timestamp(ts)
-    if t.tzinfo is not None:
-        t = t.tz_localize(None)
-    return t
 
-
-def has_coverage(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> bool:
-    if df.empty or "timestamp" not in df.columns:
+@lru_cache(maxsize=32)
+def _load_sheet_cached(
+    path_str: str, mtime_ns: int, size: int, columns: Optional[tuple[str, ...]]
+) -> pd.DataFrame:
+    try:
+        df = read_table(Path(path_str), list(columns) if columns else None)
+    except Exception:
+        return pd.DataFrame()
+    # Normalize to naive wall time once here so the window helpers never re-check the tz.
+    return normalize_sorted(df)
+
+
+def _naive(dt: datetime, tz=None) -> datetime:
+    """
+    Wall time of `dt` in `tz` (or in its own zone when tz is None), without tzinfo.
+    Naive inputs are already wall time in the data timezone and pass through unchanged.
+    """
+    if dt.tzinfo is None:
+        return dt
+    if tz is not None:
+        dt = dt.astimezone(tz)
+    return dt.replace(tzinfo=None)
+
+
+def has_coverage(df: pd.DataFrame, start: datetime, end: datetime) -> bool:
+    # load_sheet()/ensure_data() frames are sorted, so the bounds are the first/last rows.
+    min_ts, max_ts = timestamp_bounds(df)
+    if min_ts is None:
         return False
-    min_ts, max_ts = df["timestamp"].min(), df["timestamp"].max()
-    start = _ensure_naive(start)
-    end = _ensure_naive(end)
-    min_ts = _ensure_naive(min_ts)
-    max_ts = _ensure_naive(max_ts)
+    start = _naive(start)
+    end = _naive(end)
     return pd.notnull(min_ts) and pd.notnull(max_ts) and min_ts <= start and max_ts >= end
 
 
-def filter_window(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+def filter_window(df: pd.DataFrame, start: datetime, end: datetime) -> pd.DataFrame:
+    """
+    Rows of a load_sheet() frame (naive, sorted timestamps) between start and end inclusive.
+    """
     if df.empty or "timestamp" not in df.columns:
         return pd.DataFrame()
-    start = _ensure_naive(start)
-    end = _ensure_naive(end)
-    ts = df["timestamp"]
-    if pd.api.types.is_datetime64tz_dtype(ts):
-        ts = ts.dt.tz_localize(None)
-    mask = (ts >= start) & (ts <= end)
-    return df.loc[mask].reset_index(drop=True)
+    ts = df["timestamp"].to_numpy()
+    lo = np.searchsorted(ts, np.datetime64(_naive(start)), side="left")
+    hi = np.searchsorted(ts, np.datetime64(_naive(end)), side="right")
+    return df.iloc[lo:hi].reset_index(drop=True)
 
 
 def compute_volume_stats(df: pd.DataFrame) -> Optional[dict]:
     if df.empty or "volume" not in df.columns:
         return None
-    volumes = pd.to_numeric(df["volume"], errors="coerce").dropna()
-    if volumes.empty:
+    col = df["volume"]
+    # Typed readers already yield float64; only object columns need the coercing parse.
+    if col.dtype.kind != "f":
+        col = pd.to_numeric(col, errors="coerce")
+    volumes = col.to_numpy(dtype=np.float64)
+    rows, avg_volume, p95_volume = volume_stats(volumes)
+    if rows == 0:
         return None
     return {
-        "rows": len(volumes),
-        "avg_volume": volumes.mean(),
-        "p95_volume": volumes.quantile(0.95),
+        "rows": int(rows),
+        "avg_volume": float(avg_volume),
+        "p95_volume": float(p95_volume),
     }
 
 
@@ -91,13 +116,13 @@ def ensure_data(
     cfg: AppConfig,
     symbol: str,
     interval: str,
-    start_local: pd.Timestamp,
-    end_local: pd.Timestamp,
+    start_local: datetime,
+    end_local: datetime,
     start_utc,
     end_utc,
     logger: logging.Logger,
 ) -> pd.DataFrame:
-    existing = load_sheet(cfg.excel, symbol, interval)
+    existing = load_sheet(cfg.excel, symbol, interval, _STATS_COLUMNS)
     if has_coverage(existing, start_local, end_local):
         logger.info("Using existing Excel data", extra={"symbol": symbol, "interval": interval})
         return existing
@@ -106,20 +131,17 @@ def ensure_data(
     raw = fetch_klines(symbol, interval, start_utc, end_utc, cfg.request, logger)
     fetched = klines_to_dataframe(raw, symbol, interval, cfg.timezone)
     write_dataframe(fetched, cfg.excel, symbol, interval, logger)
-    combined = load_sheet(cfg.excel, symbol, interval)
-    return combined
-
-
-def to_data_timezone(dt: pd.Timestamp, tz) -> pd.Timestamp:
-    ts = pd.Timestamp(dt)
-    if tz:
-        if ts.tzinfo is None:
-            ts = ts.tz_localize(tz)
-        else:
-            ts = ts.tz_convert(tz)
-    if ts.tzinfo is not None:
-        ts = ts.tz_localize(None)
-    return ts
+    if fetched.empty:
+        return existing
+    # Rebuild what was just stored in memory instead of parsing the file again.
+    fresh = normalize_timestamp(fetched[list(_STATS_COLUMNS)].copy())
+    if not cfg.excel.append:
+        return fresh
+    return merge_sorted_frames([existing, fresh], subset=("timestamp",))
+
+
+def to_data_timezone(dt: datetime, tz) -> datetime:
+    return _naive(dt, tz)
 
 
 def resolve_window_with_overrides(
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, Optional
+import re
+from functools import lru_cache
+from typing import Any, Iterable, Optional
 
+import numpy as np
 import pandas as pd
 
 from .config import resolve_timezone
@@ -22,32 +25,81 @@ RAW_COLUMNS = [
 ]
 
 
+NUMERIC_COLUMNS = ["open", "high", "low", "close", "volume", "quote_volume", "taker_buy_base", "taker_buy_quote"]
+# Output column order, kept stable so appends line up with existing CSV headers.
+_OUTPUT_COLUMNS = ["open", "high", "low", "close", "volume", "quote_volume", "trades", "taker_buy_base", "taker_buy_quote"]
+
+
 def klines_to_dataframe(
     klines: list[list[Any]],
     symbol: str,
     interval: str,
     tz_name: Optional[str],
 ) -> pd.DataFrame:
-    df = pd.DataFrame(klines, columns=RAW_COLUMNS)
-    if df.empty:
-        return df
+    if not klines:
+        return pd.DataFrame(columns=RAW_COLUMNS)
+
+    # Transpose the row lists into per-column tuples once; close_time/ignore are never materialized.
+    raw = dict(zip(RAW_COLUMNS, zip(*klines)))
+    open_ms = np.asarray(raw["open_time"], dtype=np.int64)
+    keep = None
+    if not np.all(np.diff(open_ms) > 0):
+        # Sort + dedup (first occurrence wins) on the int64 open times in one pass.
+        _, keep = np.unique(open_ms, return_index=True)
+        open_ms = open_ms[keep]
+
+    columns: dict[str, Any] = {}
+    for col in _OUTPUT_COLUMNS:
+        # Binance sends prices/volumes as strings; np.asarray parses each column in C.
+        values = np.asarray(raw[col], dtype=np.int64 if col == "trades" else np.float64)
+        if keep is not None:
+            values = values[keep]
+        columns[col] = pd.array(values, dtype="Int64") if col == "trades" else values
+    df = pd.DataFrame(columns, copy=False)
 
-    ts_utc = pd.to_datetime(df["open_time"], unit="ms", utc=True)
+    # Open times are UTC epoch ms: widen to ns in one cast, then tag as UTC (metadata only).
+    ts = pd.DatetimeIndex(open_ms.view("datetime64[ms]").astype("datetime64[ns]")).tz_localize("UTC")
     tz = resolve_timezone(tz_name)
-    ts = ts_utc.dt.tz_convert(tz) if tz else ts_utc
-    df["timestamp"] = ts
+    df["timestamp"] = ts.tz_convert(tz) if tz else ts
 
-    numeric_cols = ["open", "high", "low", "close", "volume", "quote_volume", "taker_buy_base", "taker_buy_quote"]
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-    df["trades"] = pd.to_numeric(df["trades"], errors="coerce").astype("Int64")
+    # Constant per call: one int8 code per row instead of an object pointer.
+    codes = np.zeros(len(df), dtype=np.int8)
+    df["interval"] = pd.Categorical.from_codes(codes, categories=[interval])
+    df["symbol"] = pd.Categorical.from_codes(codes, categories=[symbol])
+    return df
 
-    df["interval"] = interval
-    df["symbol"] = symbol
 
-    df = df.drop(columns=["ignore", "close_time", "open_time"])
-    df = df.drop_duplicates(subset=["timestamp", "symbol", "interval"]).sort_values("timestamp")
-    return df.reset_index(drop=True)
+def merge_sorted_frames(
+    parts: Iterable[pd.DataFrame],
+    key: str = "timestamp",
+    subset: tuple[str, ...] = ("timestamp", "symbol", "interval"),
+) -> pd.DataFrame:
+    """
+    Concatenate frames that are each sorted by `key` and drop duplicate `subset` rows, keeping the last.
+
+    A stable sort on `key` then the rest of `subset` puts duplicates next to each other even when a
+    file mixes symbols/intervals, so they are removed with one vectorized neighbour comparison.
+    """
+    frames = [part for part in parts if not part.empty]
+    if not frames:
+        return pd.DataFrame()
+    combined = pd.concat(frames, ignore_index=True, sort=False)
+    rest = [col for col in subset if col != key]
+    if all((combined[col].to_numpy() == combined[col].iat[0]).all() for col in rest):
+        # Common case (one symbol/interval per file): near-linear merge sort over the sorted runs.
+        order = np.argsort(combined[key].to_numpy(), kind="mergesort")
+        combined = combined.take(order)
+    else:
+        # Multi-key sorts in pandas are stable, so later frames still win among duplicates.
+        combined = combined.sort_values([key, *rest], kind="mergesort")
+    if len(combined) < 2:
+        return combined.reset_index(drop=True)
+    same_as_next = np.ones(len(combined) - 1, dtype=bool)
+    for col in subset:
+        values = combined[col].to_numpy()
+        same_as_next &= values[1:] == values[:-1]
+    keep = np.append(~same_as_next, True)
+    return combined[keep].reset_index(drop=True)
 
 
 def count_missing_rows(df: pd.DataFrame, interval: str) -> Optional[int]:
@@ -62,11 +114,11 @@ def count_missing_rows(df: pd.DataFrame, interval: str) -> Optional[int]:
     return max(missing, 0)
 
 
+_INTERVAL_RE = re.compile(r"^\s*(\d+)\s*([mhdw])\s*$", re.I)
+_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+@lru_cache(maxsize=64)
 def _interval_seconds(interval: str) -> Optional[int]:
-    interval = interval.strip().lower()
-    units = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
-    value_part = "".join(ch for ch in interval if ch.isdigit())
-    unit_part = "".join(ch for ch in interval if ch.isalpha())
-    if not value_part or unit_part not in units:
-        return None
-    return int(value_part) * units[unit_part]
+    m = _INTERVAL_RE.match(interval)
+    return int(m.group(1)) * _UNITS[m.group(2).lower()] if m else None
@@ -3,9 +3,11 @@ from __future__ import annotations
 import streamlit as st
 
 from pathlib import Path
+import functools
+import os
 import sys
-import pandas as pd
 from datetime import datetime, date, time
+from time import monotonic
 
 if __package__ in (None, ""):
     # Allow running via `streamlit run app/ui.py` without package context.
@@ -15,9 +17,38 @@ from app.ingest import build_logger
 from app.run_op import run_fetch, run_generate_slice
 from app.operations import load_operations
 from app.config import load_config
+from app.csv_writer import data_path, read_tail
 from app.stats import run_volume_stats
 
 
+@st.cache_data
+def _load_config_cached(path_str: str, mtime: float):
+    return load_config(path_str)
+
+
+@functools.lru_cache(maxsize=64)
+def _path_exists(path_str: str, tick: int) -> bool:
+    # `tick` is the current second, so a result is reused for at most one second of reruns.
+    return os.path.exists(path_str)
+
+
+@st.cache_data(ttl=300)
+def _run_volume_stats_cached(
+    config_path: str,
+    config_mtime: float,
+    symbol: str,
+    interval: str,
+    start: str | None,
+    end: str | None,
+    lookback: str | None,
+    input_tz: str | None,
+    _logger,
+):
+    # Keyed on the config file version and the op inputs; the logger is not hashed.
+    cfg = _load_config_cached(config_path, config_mtime)
+    return run_volume_stats(cfg, symbol, interval, start, end, lookback, input_tz, default_lookback=None, logger=_logger)
+
+
 def render_op_form(op):
     st.subheader(f"Operation: {op.name}")
     symbol = st.text_input("Symbol", op.symbol)
@@ -38,20 +69,18 @@ def render_op_form(op):
     col1, col2 = st.columns(2)
     with col1:
         start_date = st.date_input("Start date", value=start_defaults[0])
-        start_hour = st.select_slider("Start hour", options=list(range(24)), value=start_defaults[1].hour)
-        start_min = st.select_slider("Start minute", options=list(range(0, 60, 5)), value=start_defaults[1].minute - start_defaults[1].minute % 5)
+        start_clock = st.time_input("Start time", value=time(start_defaults[1].hour, start_defaults[1].minute), step=60)
         lookback = st.text_input("Lookback (e.g., 1d, optional)", op.lookback or "")
     with col2:
         end_date = st.date_input("End date", value=end_defaults[0])
-        end_hour = st.select_slider("End hour", options=list(range(24)), value=end_defaults[1].hour)
-        end_min = st.select_slider("End minute", options=list(range(0, 60, 5)), value=end_defaults[1].minute - end_defaults[1].minute % 5)
+        end_clock = st.time_input("End time", value=time(end_defaults[1].hour, end_defaults[1].minute), step=60)
         time_tz = st.text_input("Time input timezone", op.time_input_timezone or "")
 
-    def combine(d: date, hh: int, mm: int) -> str | None:
-        return datetime.combine(d, time(hh, mm)).isoformat()
+    def combine(d: date, t: time) -> str | None:
+        return datetime.combine(d, time(t.hour, t.minute)).isoformat()
 
-    start_time = combine(start_date, start_hour, start_min)
-    end_time = combine(end_date, end_hour, end_min)
+    start_time = combine(start_date, start_clock)
+    end_time = combine(end_date, end_clock)
     slice_output = st.text_input("Slice output path (only for slice op, optional)", op.slice_output_path or "")
     return {
         "symbol": symbol,
@@ -74,7 +103,9 @@ def main():
         st.experimental_set_query_params(reload="1")
 
     try:
-        cfg = load_config(Path(config_path))
+        # Reruns on every widget change; re-parse only when the file changes.
+        config_mtime = os.path.getmtime(config_path)
+        cfg = _load_config_cached(config_path, config_mtime)
     except Exception as exc:
         st.error(f"Failed to load config: {exc}")
         return
@@ -110,31 +141,31 @@ def main():
     code = 0
 
     def show_csv_preview(cfg, symbol: str, interval: str, suffix: str = "", caption: str | None = None):
-        csv_path = Path(str(cfg.excel.path).format(symbol=symbol, interval=interval))
+        csv_path = data_path(cfg.excel, symbol, interval)
         if suffix:
             csv_path = csv_path.with_name(f"{csv_path.stem}{suffix}{csv_path.suffix}")
-        if not csv_path.exists():
+        if not _path_exists(str(csv_path), int(monotonic())):
             st.info(f"No CSV found at {csv_path}")
             return
-        df = pd.read_csv(csv_path)
+        df = read_tail(csv_path, 50)
         st.caption(caption or str(csv_path))
-        st.dataframe(df.tail(50))
+        st.dataframe(df)
 
     if op.type == "fetch":
         code = run_fetch(op, cfg, logger)
         if code == 0:
             show_csv_preview(cfg, op.symbol, op.interval, caption="Fetch result (latest CSV)")
     elif op.type == "volume_stats":
-        stats = run_volume_stats(
-            cfg,
+        stats = _run_volume_stats_cached(
+            config_path,
+            config_mtime,
             op.symbol,
             op.interval,
             op.start_time,
             op.end_time,
             op.lookback,
             op.time_input_timezone,
-            default_lookback=None,
-            logger=logger,
+            logger,
         )
         if not stats:
             code = 1